@@ -1,28 +1,126 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, g, request, jsonify, render_template, stream_with_context
 from model.rag_modelv4 import ask_question, refresh_web_data
+from model import precomputed_answers
+from model.services.metrics import observe, render_prometheus, timed
+from model.services.traffic_capture import TrafficCapture
+from model.services.weather_alerts import AlertHub
+from assets import build_static, create_assets, send_static_precompressed
 from datetime import datetime
+import json
 import logging
 import os
+import threading
+import time
 import requests
 from dotenv import load_dotenv
+from jinja2 import FileSystemBytecodeCache
 
 # --- App setup ---
+load_dotenv()
 app = Flask(__name__)
-app.config['TEMPLATES_AUTO_RELOAD'] = True
-app.jinja_env.auto_reload = True
-app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
+# APP_ENV=production: cached templates, bundled/pre-compressed static assets
+APP_ENV = os.getenv("APP_ENV", "development")
+PRODUCTION = APP_ENV == "production"
+if PRODUCTION:
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    app.jinja_env.auto_reload = False
+    # Unfingerprinted static files; bundles under static/gen/ are immutable
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = int(os.getenv("STATIC_MAX_AGE", "3600"))
+    jinja_cache_dir = os.path.join(app.instance_path, "jinja_cache")
+    os.makedirs(jinja_cache_dir, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_dir)
+    app.view_functions['static'] = send_static_precompressed
+else:
+    app.config['TEMPLATES_AUTO_RELOAD'] = True
+    app.jinja_env.auto_reload = True
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
+
+assets = create_assets(app, production=PRODUCTION)
+if PRODUCTION:
+    # Only rebuilds what changed, so this is a no-op after serve.py's build
+    build_static(assets)
 
-load_dotenv()
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
+# Upstream endpoints (overridable so benchmarks can point at local stand-ins)
+OPENWEATHER_GEO_URL = os.getenv("OPENWEATHER_GEO_URL", "http://api.openweathermap.org/geo/1.0/direct")
+NOMINATIM_URL = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org/search")
+OPEN_METEO_URL = os.getenv("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
 
 # Logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+# Optional file log of /ask questions, mined for precomputed answers
+ASK_LOG_PATH = os.getenv("ASK_LOG_PATH")
+if ASK_LOG_PATH:
+    ask_log_handler = logging.FileHandler(ASK_LOG_PATH, encoding="utf-8")
+    ask_log_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(ask_log_handler)
+
+# Serve precomputed answers once this many /ask requests are already in flight
+PRECOMPUTED_SERVE_CONCURRENCY = int(os.getenv("PRECOMPUTED_SERVE_CONCURRENCY", "2"))
+ask_state_lock = threading.Lock()
+asks_in_flight = 0
+# count the idle period from process start, not from the epoch
+last_ask_at = time.time()
+
+def is_idle():
+    with ask_state_lock:
+        return asks_in_flight == 0 and time.time() - last_ask_at >= precomputed_answers.IDLE_SECONDS
+
+precomputed_answers.start_background_precompute(is_idle)
+
+# Opt-in anonymized capture of /ask, /weather and /forecast traffic for bench.replay
+TRAFFIC_CAPTURE_PATH = os.getenv("TRAFFIC_CAPTURE_PATH")
+CAPTURED_ENDPOINTS = {"ask", "get_weather", "get_forecast"}
+traffic_capture = TrafficCapture(TRAFFIC_CAPTURE_PATH, os.getenv("TRAFFIC_CAPTURE_SALT")) if TRAFFIC_CAPTURE_PATH else None
 
 @app.context_processor
 def inject_now():
     return {'now': datetime.now()}
 
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+    g.request_started_at = time.time()
+
+# Streaming responses finish long after after_request runs, so their
+# latency here would only be the time to build the Response
+UNTIMED_ENDPOINTS = (None, "static", "metrics", "alerts_stream")
+
+@app.after_request
+def record_request_latency(response):
+    start = g.get("request_start")
+    if start is not None and request.endpoint not in UNTIMED_ENDPOINTS:
+        observe(
+            "http_request_duration_seconds",
+            time.perf_counter() - start,
+            endpoint=request.endpoint,
+            method=request.method,
+            status=response.status_code,
+        )
+    return response
+
+@app.after_request
+def capture_traffic(response):
+    if traffic_capture is None or request.endpoint not in CAPTURED_ENDPOINTS:
+        return response
+    try:
+        body = request.get_json(silent=True) if request.method == "POST" else None
+        traffic_capture.record(
+            ts=g.request_started_at,
+            address=request.remote_addr,
+            method=request.method,
+            path=request.path,
+            query={"city": request.args["city"]} if "city" in request.args else {},
+            body=body if isinstance(body, dict) else None,
+            status=response.status_code,
+            latency_ms=(time.perf_counter() - g.request_start) * 1000,
+            cache=response.headers.get("X-Cache"),
+        )
+    except Exception:
+        logger.exception("Traffic capture failed")
+    return response
+
 # Geocoding to pass it to open meteo
 def geocode(city_name):
     """
@@ -31,8 +129,9 @@ def geocode(city_name):
     """
     try:
         if OPENWEATHER_API_KEY:
-            url = f"http://api.openweathermap.org/geo/1.0/direct?q={requests.utils.requote_uri(city_name)}&limit=1&appid={OPENWEATHER_API_KEY}"
-            r = requests.get(url, timeout=6)
+            url = f"{OPENWEATHER_GEO_URL}?q={requests.utils.requote_uri(city_name)}&limit=1&appid={OPENWEATHER_API_KEY}"
+            with timed("geocode", provider="openweather"):
+                r = requests.get(url, timeout=6)
             arr = r.json()
             if isinstance(arr, list) and len(arr) > 0:
                 lat = arr[0].get("lat")
@@ -43,8 +142,9 @@ def geocode(city_name):
                 display = f"{name}" + (f", {state}" if state else "") + (f", {country}" if country else "")
                 return float(lat), float(lon), display
         # fallback api in case the first one fail
-        nom_url = f"https://nominatim.openstreetmap.org/search?q={requests.utils.requote_uri(city_name)}&format=json&limit=1"
-        r = requests.get(nom_url, headers={"User-Agent": "DisasterAlertBot/1.0 (youremail@example.com)"}, timeout=6)
+        nom_url = f"{NOMINATIM_URL}?q={requests.utils.requote_uri(city_name)}&format=json&limit=1"
+        with timed("geocode", provider="nominatim"):
+            r = requests.get(nom_url, headers={"User-Agent": "DisasterAlertBot/1.0 (youremail@example.com)"}, timeout=6)
         arr = r.json()
         if isinstance(arr, list) and len(arr) > 0:
             lat = arr[0].get("lat")
@@ -64,6 +164,11 @@ def index():
 
 @app.route("/ask", methods=["POST"])
 def ask():
+    global asks_in_flight, last_ask_at
+    with ask_state_lock:
+        busy = asks_in_flight >= PRECOMPUTED_SERVE_CONCURRENCY
+        asks_in_flight += 1
+        last_ask_at = time.time()
     try:
         data = request.get_json()
         if not data:
@@ -74,21 +179,30 @@ def ask():
             logger.warning("Empty message received")
             return jsonify({"answer": "Please enter a question."}), 400
         logger.info(f"Received question: {message}")
+        if busy:
+            answer = precomputed_answers.lookup(message)
+            if answer is not None:
+                logger.info("Served precomputed answer")
+                return jsonify({"answer": answer}), 200, {"X-Cache": "HIT"}
         answer = ask_question(message)
         logger.info(f"Generated answer: {answer[:100]}...")
-        return jsonify({"answer": answer}), 200
+        return jsonify({"answer": answer}), 200, {"X-Cache": "MISS"}
     except Exception as e:
         logger.error(f"Error processing question: {str(e)}", exc_info=True)
         return jsonify({"answer": "Sorry, I encountered an error. Please try again."}), 500
+    finally:
+        with ask_state_lock:
+            asks_in_flight -= 1
 
 
 @app.route("/refresh", methods=["POST"])
 def refresh():
     try:
         logger.info("Refreshing web data...")
-        refresh_web_data()
-        logger.info("Web data refreshed successfully")
-        return jsonify({"status": "success", "message": "Web sources refreshed!"}), 200
+        report = refresh_web_data()
+        precomputed_answers.mark_stale()
+        logger.info(f"Web data refreshed successfully: {report}")
+        return jsonify({"status": "success", "message": "Web sources refreshed!", "dedup": report}), 200
     except Exception as e:
         logger.error(f"Error refreshing data: {str(e)}", exc_info=True)
         return jsonify({"status": "error", "message": f"Refresh failed: {str(e)}"}), 500
@@ -122,10 +236,79 @@ WEATHERCODE_MAP = {
 }
 
 
+def fetch_current_weather(city, lat, lon, display_city):
+    """
+    Fetch current conditions for a geocoded city from Open-Meteo and map them
+    to the /weather response shape. Raises on upstream failure.
+    """
+    # Open-Meteo: request current weather and forecast
+    url = (
+        f"{OPEN_METEO_URL}"
+        f"?latitude={lat}&longitude={lon}"
+        "&current_weather=true"
+        "&daily=temperature_2m_max,temperature_2m_min,weathercode,precipitation_sum"
+        "&timezone=Asia%2FManila"
+        "&forecast_days=1"
+    )
+    with timed("open_meteo", endpoint="current"):
+        r = requests.get(url, timeout=8)
+    data = r.json()
+
+    # read current weather
+    cw = data.get("current_weather") or {}
+    fetched_at = cw.get("time")
+
+    code = int(cw["weathercode"]) if cw.get("weathercode") is not None else None
+    cond, icon = WEATHERCODE_MAP.get(code, ("Unknown", "bi-cloud"))
+
+    return {
+        "city": city,
+        "display_city": display_city,
+        "temp": round(cw.get("temperature")) if cw.get("temperature") is not None else None,
+        "feels_like": None,
+        "humidity": None,
+        "wind": cw.get("windspeed"),
+        "condition": cond,
+        "icon": icon,
+        "weathercode": code,
+        "provider": "Open-Meteo",
+        "fetched_at": fetched_at
+    }
+
+
+# Severe-weather alert fan-out: one upstream poll per tracked city, pushed to
+# every subscribed browser over Server-Sent Events
+ALERT_POLL_SECONDS = float(os.getenv("ALERT_POLL_SECONDS", "300"))
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", "10"))
+SSE_HEARTBEAT_SECONDS = 15
+# Streams end after this long and the browser reconnects (EventSource retry),
+# so a stream whose client vanished never holds a worker thread indefinitely
+ALERT_STREAM_MAX_SECONDS = float(os.getenv("ALERT_STREAM_MAX_SECONDS", "600"))
+# Each open stream holds one request thread until it ends, so the subscriber
+# cap comes out of the server's thread budget (WEB_THREADS, see serve.py),
+# keeping ALERT_RESERVED_THREADS free for /ask, /weather and static files.
+# Browsers refused a stream fall back to fetching /weather once.
+WEB_THREADS = int(os.getenv("WEB_THREADS", "16"))
+ALERT_RESERVED_THREADS = int(os.getenv("ALERT_RESERVED_THREADS", "8"))
+ALERT_MAX_SUBSCRIBERS = int(os.getenv(
+    "ALERT_MAX_SUBSCRIBERS", str(max(WEB_THREADS - ALERT_RESERVED_THREADS, 0))
+))
+if ALERT_MAX_SUBSCRIBERS >= WEB_THREADS:
+    raise ValueError(
+        f"ALERT_MAX_SUBSCRIBERS ({ALERT_MAX_SUBSCRIBERS}) must be below WEB_THREADS ({WEB_THREADS}), "
+        "otherwise open alert streams can take every request thread"
+    )
+alert_hub = AlertHub(
+    geocode, fetch_current_weather, ALERT_POLL_SECONDS, ALERT_QUEUE_SIZE, ALERT_MAX_SUBSCRIBERS
+)
+alert_hub.start()
+
+
 @app.route("/weather", methods=["GET"])
 def get_weather():
     """
     Returns current weather using Open-Meteo current_weather.
+    Served from the alert service's last poll when the city is already tracked.
     Accepts: city=Name (no lat/lon)
     Response:
       {
@@ -137,6 +320,7 @@ def get_weather():
         "wind": 1.34,
         "condition":"Broken Clouds",
         "icon":"bi-cloud",
+        "weathercode": 3,
         "provider":"Open-Meteo",
         "fetched_at":"2025-11-20T04:00:00Z"
       }
@@ -145,6 +329,11 @@ def get_weather():
 
     if not city:
         return jsonify({"error": "Please provide a city name via ?city=..."}), 400
+
+    cached = alert_hub.latest(city)
+    if cached is not None:
+        return jsonify(cached), 200, {"X-Cache": "HIT"}
+
     # geocode the city into lat/lon
     coords = geocode(city)
     if not coords:
@@ -152,44 +341,51 @@ def get_weather():
 
     lat, lon, display_city = coords
     try:
-        # Open-Meteo: request current weather and forecast
-        url = (
-            "https://api.open-meteo.com/v1/forecast"
-            f"?latitude={lat}&longitude={lon}"
-            "&current_weather=true"
-            "&daily=temperature_2m_max,temperature_2m_min,weathercode,precipitation_sum"
-            "&timezone=Asia%2FManila"
-            "&forecast_days=1"
-        )
-        r = requests.get(url, timeout=8)
-        data = r.json()
-
-        # read current weather
-        cw = data.get("current_weather") or {}
-        fetched_at = cw.get("time")
-
-        code = cw.get("weathercode")
-        cond, icon = WEATHERCODE_MAP.get(int(code) if code is not None else None, ("Unknown", "bi-cloud"))
-
-        out = {
-            "city": city,
-            "display_city": display_city,
-            "temp": round(cw.get("temperature")) if cw.get("temperature") is not None else None,
-            "feels_like": None,
-            "humidity": None,
-            "wind": cw.get("windspeed"),
-            "condition": cond,
-            "icon": icon,
-            "provider": "Open-Meteo",
-            "fetched_at": fetched_at
-        }
-        return jsonify(out), 200
+        return jsonify(fetch_current_weather(city, lat, lon, display_city)), 200, {"X-Cache": "MISS"}
 
     except Exception as e:
         app.logger.exception("Open-Meteo current fetch failed")
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/alerts/stream", methods=["GET"])
+def alerts_stream():
+    """
+    Server-Sent Events stream of current weather ("weather" events) and
+    severe-weather alerts ("alert" events) for ?city=Name.
+    """
+    city = request.args.get("city")
+
+    if not city:
+        return jsonify({"error": "Please provide a city name via ?city=..."}), 400
+
+    sub = alert_hub.subscribe(city)
+    if sub is None:
+        return jsonify({"error": "Too many open alert streams, try again later."}), 503, {"Retry-After": "30"}
+
+    def stream():
+        deadline = time.time() + ALERT_STREAM_MAX_SECONDS
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return
+                event = sub.get(timeout=min(SSE_HEARTBEAT_SECONDS, remaining))
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            alert_hub.unsubscribe(sub)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/forecast", methods=["GET"])
 def get_forecast():
     """
@@ -210,13 +406,14 @@ def get_forecast():
 
     try:
         om_url = (
-            "https://api.open-meteo.com/v1/forecast"
+            f"{OPEN_METEO_URL}"
             f"?latitude={lat}&longitude={lon}"
             "&daily=temperature_2m_max,temperature_2m_min,weathercode,precipitation_sum"
             "&timezone=Asia%2FManila"
             "&forecast_days=7"
         )
-        r = requests.get(om_url, timeout=8)
+        with timed("open_meteo", endpoint="forecast"):
+            r = requests.get(om_url, timeout=8)
         om = r.json()
 
         daily = []
@@ -250,6 +447,16 @@ def get_forecast():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Prometheus scrape endpoint: per-stage latency histograms (embed, similarity
+    search, prompt assembly, generation, geocode, Open-Meteo, scrape), request
+    latency per endpoint and Ollama token counters.
+    """
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
 # Error Handlers
 @app.errorhandler(404)
 def not_found(error):
@@ -264,7 +471,7 @@ def internal_error(error):
 # Run app
 if __name__ == "__main__":
     app.run(
-        debug=True,
+        debug=not PRODUCTION,
         host='0.0.0.0',
         port=5000
     )
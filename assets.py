@@ -0,0 +1,95 @@
+"""
+Static asset bundles (Flask-Assets). In development the individual files are
+served as before; in production they are minified into content-hashed bundles
+under static/gen/ and pre-compressed to .gz/.br for send_static_precompressed.
+"""
+import gzip
+import mimetypes
+import os
+from flask import current_app, request, send_from_directory
+from flask_assets import Bundle, Environment
+from werkzeug.security import safe_join
+
+GEN_DIR = "gen"
+MANIFEST_FILE = "manifest.json"
+# Fingerprinted bundles never change under the same URL
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+CSS_FILES = ["css/styles.css"]
+JS_FILES = ["js/botReply.js", "js/weather.js"]
+
+
+def create_assets(app, production: bool) -> Environment:
+    assets = Environment(app)
+    assets.debug = not production
+    # Bundles are built once (build_static) rather than checked on every request
+    assets.auto_build = not production
+    assets.url_expire = False
+    assets.manifest = "json:" + os.path.join(app.static_folder, GEN_DIR, MANIFEST_FILE)
+    assets.register("css_all", Bundle(*CSS_FILES, filters="rcssmin", output=f"{GEN_DIR}/app.%(version)s.css"))
+    assets.register("js_all", Bundle(*JS_FILES, filters="rjsmin", output=f"{GEN_DIR}/app.%(version)s.js"))
+    return assets
+
+
+def _compress(path: str, suffix: str, data: bytes) -> bool:
+    target = path + suffix
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+        return False
+    if suffix == ".gz":
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    else:
+        import brotli
+        compressed = brotli.compress(data, quality=11)
+    with open(target, "wb") as f:
+        f.write(compressed)
+    return True
+
+
+def build_static(assets: Environment) -> dict:
+    """Build every bundle (if its sources changed) and pre-compress the output."""
+    os.makedirs(os.path.join(assets.directory, GEN_DIR), exist_ok=True)
+    for bundle in assets:
+        bundle.build()
+    gen_dir = os.path.join(assets.directory, GEN_DIR)
+    suffixes = [".gz"]
+    try:
+        import brotli  # noqa: F401
+        suffixes.append(".br")
+    except ImportError:
+        print("[WARNING] brotli is not installed; only gzip copies will be written")
+    written = 0
+    for name in os.listdir(gen_dir):
+        path = os.path.join(gen_dir, name)
+        if name == MANIFEST_FILE or name.endswith((".gz", ".br")) or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        written += sum(_compress(path, suffix, data) for suffix in suffixes)
+    urls = {bundle.output: bundle.urls()[0] for bundle in assets}
+    print(f"[DEBUG] Built static bundles {list(urls.values())}, wrote {written} compressed files")
+    return urls
+
+
+def send_static_precompressed(filename):
+    """
+    Production replacement for Flask's static view: serves a .br/.gz sibling
+    when the client accepts it, and marks fingerprinted bundles immutable.
+    """
+    static_folder = current_app.static_folder
+    immutable = filename.startswith(GEN_DIR + "/")
+    max_age = IMMUTABLE_MAX_AGE if immutable else None
+    response = None
+    for encoding, suffix in PRECOMPRESSED:
+        candidate = safe_join(static_folder, filename + suffix)
+        if encoding in request.accept_encodings and candidate is not None and os.path.isfile(candidate):
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            response = send_from_directory(static_folder, filename + suffix, mimetype=mimetype, max_age=max_age)
+            response.headers["Content-Encoding"] = encoding
+            break
+    if response is None:
+        response = send_from_directory(static_folder, filename, max_age=max_age)
+    response.headers["Vary"] = "Accept-Encoding"
+    if immutable:
+        response.headers["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return response
@@ -0,0 +1,180 @@
+"""
+Local stand-ins for every network dependency of the app, so benchmarks run
+offline: an Ollama HTTP server with a configurable generation speed, an
+Open-Meteo/Nominatim stand-in, and a fixture server for the scraped pages.
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "web_snapshot")
+SNAPSHOT_INDEX = os.path.join(FIXTURE_DIR, "index.json")
+
+FAKE_ANSWER_WORDS = (
+    "Prepare a go bag with water, food, flashlight, radio, first aid kit and copies of documents. "
+    "Follow PAGASA and NDRRMC advisories, secure your home, and evacuate early if told to do so. "
+).split()
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status: int = 200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+
+# -------------------- OLLAMA --------------------
+class FakeOllamaHandler(QuietHandler):
+    """Implements the /api/generate subset used by langchain_ollama.OllamaLLM."""
+    tokens_per_second = 40.0
+    answer_tokens = 120
+    prompt_latency = 0.05
+
+    def do_GET(self):
+        if self.path.startswith("/api/tags"):
+            return self.send_json({"models": [{"name": "llama3.2:3b", "model": "llama3.2:3b"}]})
+        self.send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        if not self.path.startswith("/api/generate"):
+            return self.send_json({"error": "not found"}, 404)
+        payload = self.read_json()
+        model = payload.get("model", "llama3.2:3b")
+        prompt_tokens = len(payload.get("prompt", "").split())
+        delay = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        time.sleep(self.prompt_latency)
+
+        def chunk(text: str, done: bool) -> Dict:
+            item = {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ"), "response": text, "done": done}
+            if done:
+                item.update({
+                    "done_reason": "stop",
+                    "prompt_eval_count": prompt_tokens,
+                    "eval_count": self.answer_tokens,
+                    "total_duration": 0,
+                })
+            return item
+
+        words = [FAKE_ANSWER_WORDS[i % len(FAKE_ANSWER_WORDS)] for i in range(self.answer_tokens)]
+        if payload.get("stream", True) is False:
+            time.sleep(delay * len(words))
+            item = chunk(" ".join(words), True)
+            return self.send_json(item)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for word in words:
+            time.sleep(delay)
+            self.wfile.write((json.dumps(chunk(word + " ", False)) + "\n").encode("utf-8"))
+            self.wfile.flush()
+        self.wfile.write((json.dumps(chunk("", True)) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+# -------------------- WEATHER --------------------
+class FakeWeatherHandler(QuietHandler):
+    """Serves Nominatim-style /search and Open-Meteo-style /v1/forecast responses."""
+    latency = 0.02
+    weathercode = 3
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        time.sleep(self.latency)
+        if url.path == "/search":
+            city = query.get("q", ["Baguio City"])[0]
+            return self.send_json([{"lat": "16.4023", "lon": "120.5960", "display_name": f"{city}, Philippines"}])
+        if url.path == "/geo/1.0/direct":
+            city = query.get("q", ["Baguio City"])[0]
+            return self.send_json([{"lat": 16.4023, "lon": 120.596, "name": city, "country": "PH"}])
+        if url.path == "/v1/forecast":
+            days = int(query.get("forecast_days", ["7"])[0])
+            dates = [time.strftime("%Y-%m-%d", time.localtime(time.time() + 86400 * i)) for i in range(days)]
+            payload = {
+                "daily": {
+                    "time": dates,
+                    "temperature_2m_max": [24.0 + i % 3 for i in range(days)],
+                    "temperature_2m_min": [16.0 + i % 2 for i in range(days)],
+                    "weathercode": [self.weathercode] * days,
+                    "precipitation_sum": [1.2] * days,
+                }
+            }
+            if query.get("current_weather", ["false"])[0] == "true":
+                payload["current_weather"] = {
+                    "temperature": 19.4,
+                    "windspeed": 7.2,
+                    "weathercode": self.weathercode,
+                    "time": time.strftime("%Y-%m-%dT%H:%M"),
+                }
+            return self.send_json(payload)
+        self.send_json({"error": "not found"}, 404)
+
+
+# -------------------- SCRAPED SITES --------------------
+def load_snapshot() -> Optional[Dict[str, str]]:
+    if not os.path.exists(SNAPSHOT_INDEX):
+        return None
+    with open(SNAPSHOT_INDEX, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def synthetic_page(url: str) -> bytes:
+    topic = url.rstrip("/").rsplit("/", 1)[-1].replace("-", " ")
+    paragraphs = "".join(
+        f"<p>{topic.title()} safety step {i}: {' '.join(FAKE_ANSWER_WORDS)}</p>\n" for i in range(40)
+    )
+    return f"<html><head><title>{topic}</title><script>var x=1;</script></head><body><nav>Home | About</nav><h1>{topic}</h1>\n{paragraphs}</body></html>".encode("utf-8")
+
+
+class FixtureSiteHandler(QuietHandler):
+    """
+    Serves /<url-quoted original URL> from the saved snapshot (see bench.snapshot),
+    or a synthetic page per URL when no snapshot has been recorded.
+    """
+    snapshot: Optional[Dict[str, str]] = None
+
+    def do_GET(self):
+        url = unquote(self.path[1:])
+        if self.snapshot is not None:
+            filename = self.snapshot.get(url)
+            if filename is None:
+                return self.send_json({"error": "not in snapshot"}, 404)
+            with open(os.path.join(FIXTURE_DIR, filename), "rb") as f:
+                body = f.read()
+        else:
+            body = synthetic_page(url)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# -------------------- SERVER HELPERS --------------------
+def start_server(handler_class, **attrs) -> ThreadingHTTPServer:
+    """Start `handler_class` on a free localhost port in a daemon thread."""
+    handler = type(handler_class.__name__, (handler_class,), attrs)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=handler_class.__name__, daemon=True).start()
+    return server
+
+
+def server_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
@@ -0,0 +1,126 @@
+"""
+Replay a traffic capture (TRAFFIC_CAPTURE_PATH in app.py) against a running
+instance, preserving the recorded inter-arrival times scaled by --speed
+(0 = send as fast as the worker pool allows):
+
+    python -m bench.replay capture.jsonl --base-url http://localhost:5000 \\
+        --speed 4 --concurrency 32 [--out replay.json]
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import requests
+from .run import percentiles
+
+
+def load_capture(path: str) -> List[Dict]:
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    entries.sort(key=lambda e: e["ts"])
+    return entries
+
+
+class ReplayStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.cache: Dict[str, Dict[str, int]] = {}
+        self.lag: List[float] = []
+
+    def record(self, path: str, latency: float, ok: bool, cache: str, lag: float):
+        with self._lock:
+            self.latencies.setdefault(path, []).append(latency)
+            self.errors[path] = self.errors.get(path, 0) + (0 if ok else 1)
+            if cache:
+                counts = self.cache.setdefault(path, {})
+                counts[cache] = counts.get(cache, 0) + 1
+            self.lag.append(lag)
+
+    def report(self, wall: float) -> Dict:
+        endpoints = {}
+        for path, samples in sorted(self.latencies.items()):
+            cache = self.cache.get(path, {})
+            hits = cache.get("HIT", 0)
+            endpoints[path] = {
+                **percentiles(samples),
+                "errors": self.errors[path],
+                "error_rate": round(self.errors[path] / len(samples), 4),
+                "cache": cache,
+                "cache_hit_ratio": round(hits / sum(cache.values()), 4) if cache else None,
+            }
+        total = sum(len(s) for s in self.latencies.values())
+        return {
+            "requests": total,
+            "wall_seconds": round(wall, 3),
+            "requests_per_second": round(total / wall, 3) if wall else None,
+            "error_rate": round(sum(self.errors.values()) / total, 4) if total else None,
+            "schedule_lag": percentiles(self.lag),
+            "endpoints": endpoints,
+        }
+
+
+def send(session_local: threading.local, base_url: str, entry: Dict, timeout: float):
+    session = getattr(session_local, "session", None)
+    if session is None:
+        session = session_local.session = requests.Session()
+    url = base_url.rstrip("/") + entry["path"]
+    if entry["method"] == "POST":
+        return session.post(url, params=entry.get("query") or None, json=entry.get("body") or {}, timeout=timeout)
+    return session.get(url, params=entry.get("query") or None, timeout=timeout)
+
+
+def replay(entries: List[Dict], base_url: str, speed: float, concurrency: int, timeout: float) -> Dict:
+    stats = ReplayStats()
+    session_local = threading.local()
+    first_ts = entries[0]["ts"] if entries else 0
+
+    def run(entry: Dict, scheduled: float):
+        lag = time.perf_counter() - scheduled
+        start = time.perf_counter()
+        try:
+            r = send(session_local, base_url, entry, timeout)
+            ok, cache = r.status_code < 400, r.headers.get("X-Cache")
+        except Exception:
+            ok, cache = False, None
+        stats.record(entry["path"], time.perf_counter() - start, ok, cache, lag)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for entry in entries:
+            scheduled = start + ((entry["ts"] - first_ts) / speed if speed > 0 else 0)
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(run, entry, scheduled)
+    return stats.report(time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay captured /ask, /weather and /forecast traffic")
+    parser.add_argument("capture", help="JSONL file written by TRAFFIC_CAPTURE_PATH")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--speed", type=float, default=1.0, help="time scale: 1 = real time, 10 = 10x faster, 0 = no delays")
+    parser.add_argument("--concurrency", type=int, default=16, help="maximum requests in flight")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--out", default=None, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    entries = load_capture(args.capture)
+    print(f"[DEBUG] Replaying {len(entries)} requests at {args.speed}x with concurrency {args.concurrency}")
+    report = replay(entries, args.base_url, args.speed, args.concurrency, args.timeout)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
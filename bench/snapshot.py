@@ -0,0 +1,35 @@
+"""
+Record a snapshot of WEB_SOURCES for the fixture server (needs network once):
+
+    python -m bench.snapshot
+"""
+import hashlib
+import json
+import os
+import requests
+from model.services.data_scrape import WEB_SOURCES
+from .fakes import FIXTURE_DIR, SNAPSHOT_INDEX
+
+
+def record_snapshot():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    index = {}
+    for url in WEB_SOURCES:
+        try:
+            r = requests.get(url, headers={"User-Agent": "DisasterAlertBot/1.0 (benchmark snapshot)"}, timeout=15)
+            r.raise_for_status()
+        except Exception as e:
+            print(f"[ERROR] Failed to snapshot {url}: {e}")
+            continue
+        filename = hashlib.sha1(url.encode("utf-8")).hexdigest() + ".html"
+        with open(os.path.join(FIXTURE_DIR, filename), "wb") as f:
+            f.write(r.content)
+        index[url] = filename
+        print(f"[DEBUG] Saved {url} ({len(r.content)} bytes)")
+    with open(SNAPSHOT_INDEX, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    print(f"[DEBUG] Snapshot of {len(index)}/{len(WEB_SOURCES)} sources written to {FIXTURE_DIR}")
+
+
+if __name__ == "__main__":
+    record_snapshot()
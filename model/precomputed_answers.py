@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from .rag_modelv4 import DB_DIR, generate_answer, keyword_index
+from .services.keyword_index import chunk_key, tokenize
+
+# -------------------- CONFIG --------------------
+PRECOMPUTED_PATH = os.path.join(DB_DIR, "precomputed_answers.json")
+# Optional file with one question per line, replacing DEFAULT_QUESTIONS
+QUESTIONS_FILE = os.getenv("PRECOMPUTE_QUESTIONS_FILE")
+# Optional /ask log (see ASK_LOG_PATH in app.py) to mine frequent questions from
+ASK_LOG_PATH = os.getenv("ASK_LOG_PATH")
+MINED_QUESTIONS = int(os.getenv("PRECOMPUTE_MINED_QUESTIONS", "20"))
+# Set to 0 to turn the background precompute job off (lookups still work)
+ENABLED = os.getenv("PRECOMPUTE_ENABLED", "1") != "0"
+# Seconds without an /ask request before the background job starts generating
+IDLE_SECONDS = float(os.getenv("PRECOMPUTE_IDLE_SECONDS", "60"))
+# Re-check the question list this often even without an index refresh
+RERUN_INTERVAL = float(os.getenv("PRECOMPUTE_INTERVAL", "3600"))
+
+DEFAULT_QUESTIONS = [
+    "What should I do before a typhoon?",
+    "What should I do during a typhoon?",
+    "What should I do after a typhoon?",
+    "What should I do during a flood?",
+    "What should I do during an earthquake?",
+    "What should I put in an emergency go bag?",
+    "How do I prepare for a volcanic eruption?",
+    "What are the warning signs of a tsunami?",
+    "What should I do during a landslide?",
+    "How do I give first aid for a wound?",
+    "Ano ang dapat gawin kapag may bagyo?",
+    "Ano ang dapat gawin kapag may lindol?",
+]
+
+LOG_MARKER = "Received question: "
+
+_lock = threading.Lock()
+_answers: Dict[str, Dict] = {}
+_stale = threading.Event()
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(tokenize(question))
+
+
+def _load():
+    global _answers
+    if os.path.exists(PRECOMPUTED_PATH):
+        try:
+            with open(PRECOMPUTED_PATH, "r", encoding="utf-8") as f:
+                _answers = json.load(f)
+        except Exception as e:
+            print(f"[ERROR] Failed to load precomputed answers: {e}")
+            _answers = {}
+
+
+def _save():
+    with _lock:
+        data = json.dumps(_answers)
+    tmp_path = PRECOMPUTED_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp_path, PRECOMPUTED_PATH)
+
+
+def _is_current(entry: Dict) -> bool:
+    # An answer is only valid while every chunk it was generated from is still indexed
+    return keyword_index.contains(entry.get("chunk_keys", []))
+
+
+def lookup(question: str) -> Optional[str]:
+    key = normalize_question(question)
+    with _lock:
+        entry = _answers.get(key)
+    if entry is None or not _is_current(entry):
+        return None
+    return entry["answer"]
+
+
+def mine_questions(log_path: str, top_n: int) -> List[str]:
+    counts = Counter()
+    originals = {}
+    try:
+        with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if LOG_MARKER not in line:
+                    continue
+                question = line.split(LOG_MARKER, 1)[1].strip()
+                key = normalize_question(question)
+                if key:
+                    counts[key] += 1
+                    originals.setdefault(key, question)
+    except OSError as e:
+        print(f"[ERROR] Failed to read ask log {log_path}: {e}")
+    return [originals[key] for key, _ in counts.most_common(top_n)]
+
+
+def get_questions() -> List[str]:
+    questions = list(DEFAULT_QUESTIONS)
+    if QUESTIONS_FILE:
+        try:
+            with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
+                questions = [line.strip() for line in f if line.strip()]
+        except OSError as e:
+            print(f"[ERROR] Failed to read {QUESTIONS_FILE}: {e}")
+    if ASK_LOG_PATH:
+        questions.extend(mine_questions(ASK_LOG_PATH, MINED_QUESTIONS))
+    return questions
+
+
+def precompute_answers(should_continue: Callable[[], bool] = lambda: True) -> Dict:
+    """
+    Generate answers for every configured question that has no current entry.
+    Stops early (keeping what was generated) as soon as `should_continue` is False.
+    """
+    start_time = time.time()
+    generated = skipped = 0
+    complete = True
+    seen = set()
+    for question in get_questions():
+        key = normalize_question(question)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        with _lock:
+            entry = _answers.get(key)
+        if entry is not None and _is_current(entry):
+            skipped += 1
+            continue
+        if not should_continue():
+            complete = False
+            break
+        try:
+            answer, docs = generate_answer(question)
+        except Exception as e:
+            print(f"[ERROR] Failed to precompute answer for '{question}': {e}")
+            continue
+        with _lock:
+            _answers[key] = {
+                "question": question,
+                "answer": answer,
+                "chunk_keys": [chunk_key(d) for d in docs],
+                "generated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+        _save()
+        generated += 1
+    print(f"[DEBUG] Precomputed {generated} answers ({skipped} still current) in {time.time() - start_time:.2f}s")
+    return {"generated": generated, "current": skipped, "complete": complete}
+
+
+def mark_stale():
+    """Ask the background job to re-check all entries, e.g. after an index refresh."""
+    _stale.set()
+
+
+def start_background_precompute(is_idle: Callable[[], bool]) -> Optional[threading.Thread]:
+    """
+    Start a daemon thread that fills the table whenever `is_idle()` has been
+    true for a while, on startup, after mark_stale(), and every RERUN_INTERVAL.
+    Returns None without starting anything when PRECOMPUTE_ENABLED=0.
+    """
+    if not ENABLED:
+        print("[DEBUG] Background precompute disabled (PRECOMPUTE_ENABLED=0)")
+        return None
+
+    def run():
+        last_run = None
+        while True:
+            due = last_run is None or _stale.is_set() or time.time() - last_run >= RERUN_INTERVAL
+            if due and is_idle():
+                _stale.clear()
+                if precompute_answers(should_continue=is_idle)["complete"]:
+                    last_run = time.time()
+                else:
+                    _stale.set()
+            time.sleep(max(IDLE_SECONDS / 4, 1))
+
+    thread = threading.Thread(target=run, name="precompute-answers", daemon=True)
+    thread.start()
+    return thread
+
+
+_load()
@@ -9,18 +9,26 @@ from langchain_chroma import Chroma
 from langchain_ollama import OllamaLLM
 from langchain_core.documents import Document
 from .services.data_scrape import fetch_disaster_data
+from .services.dedup import dedupe_chunks
+from .services.keyword_index import KeywordIndex, chunk_key
+from .services.metrics import inc, timed
 
 # -------------------- CONFIG --------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PDF_FILE = "Disaster_Preparedness_First_Aid_Handbook_Plaintext.pdf"
 PDF_PATH = os.path.join(BASE_DIR, "pdf", PDF_FILE)
-DB_DIR = os.path.join(BASE_DIR, "chroma_db")
+DB_DIR = os.getenv("CHROMA_DB_DIR", os.path.join(BASE_DIR, "chroma_db"))
 os.makedirs(DB_DIR, exist_ok=True)
 
 MAX_HISTORY_LENGTH = 5
 chat_history = deque(maxlen=MAX_HISTORY_LENGTH)
 
 TOP_K_CHUNKS = 5
+# Reciprocal-rank fusion constant for merging vector and keyword rankings
+RRF_K = 60
+# Skip the embedding/vector search when the BM25 top hit covers every query
+# term and scores at least this fraction of the best possible score
+KEYWORD_ONLY_CONFIDENCE = 0.5
 
 # -------------------- LOAD AND PREPARE DATA --------------------
 def load_pdf_chunks() -> List[Document]:
@@ -63,27 +71,68 @@ def load_web_chunks() -> List[Document]:
         print(f"[ERROR] Failed to load web sources: {e}")
         return []
 
+def open_vector_store(name: str, embeddings) -> Chroma:
+    return Chroma(embedding_function=embeddings, persist_directory=os.path.join(DB_DIR, name))
+
+def sync_vector_store(store: Chroma, chunks: List[Document]) -> int:
+    """
+    Make the persisted collection hold exactly `chunks`, keyed by chunk_key:
+    stale entries are deleted, new chunks are embedded and chunks whose
+    metadata changed (e.g. merged sources) are rewritten. Returns the number
+    of stored chunks.
+    """
+    incoming = {chunk_key(chunk): chunk for chunk in chunks}
+    stored = store.get(include=["metadatas"])
+    current = dict(zip(stored["ids"], stored["metadatas"]))
+    stale = [key for key in current if key not in incoming]
+    if stale:
+        store.delete(ids=stale)
+    added = [key for key in incoming if key not in current]
+    if added:
+        store.add_documents([incoming[key] for key in added], ids=added)
+    changed = [key for key in incoming if key in current and current[key] != incoming[key].metadata]
+    if changed:
+        store.update_documents(ids=changed, documents=[incoming[key] for key in changed])
+    print(f"[DEBUG] Vector store sync: +{len(added)} -{len(stale)} ~{len(changed)} chunks")
+    return len(incoming)
+
+def merge_web_sources(pdf_base_chunks: List[Document], web_chunks: List[Document]):
+    """
+    Dedupe web chunks against fresh copies of the PDF chunks, so the web
+    sources merged into a PDF chunk are rebuilt from scratch on every call.
+    Returns (pdf_chunks, web_chunks, report).
+    """
+    pdf_chunks = [
+        Document(page_content=chunk.page_content, metadata=dict(chunk.metadata))
+        for chunk in pdf_base_chunks
+    ]
+    web_chunks, report = dedupe_chunks(web_chunks, reference=pdf_chunks)
+    return pdf_chunks, web_chunks, report
+
 def initialize_vector_stores():
     embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-    pdf_chunks = load_pdf_chunks()
-    pdf_store = Chroma.from_documents(
-        pdf_chunks,
-        embedding=embeddings,
-        persist_directory=os.path.join(DB_DIR, "pdf_store")
-    )
-    web_chunks = load_web_chunks()
+    return build_indexes(embeddings, load_pdf_chunks(), load_web_chunks())
+
+def build_indexes(embeddings, raw_pdf_chunks: List[Document], raw_web_chunks: List[Document]):
+    """Dedupe the loaded chunks and sync them into the vector stores and keyword index."""
+    pdf_base_chunks, _ = dedupe_chunks(raw_pdf_chunks)
+    pdf_chunks, web_chunks, _ = merge_web_sources(pdf_base_chunks, raw_web_chunks)
+    pdf_store = open_vector_store("pdf_store", embeddings)
+    sync_vector_store(pdf_store, pdf_chunks)
     web_store = None
     if web_chunks:
-        web_store = Chroma.from_documents(
-            web_chunks,
-            embedding=embeddings,
-            persist_directory=os.path.join(DB_DIR, "web_store")
-        )
-    return pdf_store, web_store, embeddings
+        web_store = open_vector_store("web_store", embeddings)
+        sync_vector_store(web_store, web_chunks)
+    keyword_index = KeywordIndex.load(os.path.join(DB_DIR, "keyword_index.json"))
+    keyword_index.sync("pdf", pdf_chunks)
+    keyword_index.sync("web", web_chunks)
+    return pdf_store, web_store, embeddings, pdf_base_chunks, keyword_index
 
 # -------------------- INITIALIZE --------------------
-pdf_vector_store, web_vector_store, embeddings = initialize_vector_stores()
-llm = OllamaLLM(model="llama3.2:3b", temperature=0.6)
+# pdf_base_chunks carry only their own PDF sources; web sources are merged per refresh
+pdf_vector_store, web_vector_store, embeddings, pdf_base_chunks, keyword_index = initialize_vector_stores()
+# OLLAMA_HOST overrides the default local Ollama server
+llm = OllamaLLM(model="llama3.2:3b", temperature=0.6, base_url=os.getenv("OLLAMA_HOST"))
 
 # -------------------- PROMPT --------------------
 PROMPT_TEMPLATE = """
@@ -102,44 +151,82 @@ Answer:
 """
 
 # -------------------- RETRIEVAL --------------------
+def fuse_rankings(rankings: List[List[Document]], k: int) -> List[Document]:
+    scores = {}
+    docs = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, 1):
+            key = chunk_key(doc)
+            docs.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank)
+    ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [docs[key] for key in ranked]
+
 def retrieve_data(question: str, k: int = 5) -> tuple[List[Document], str]:
-    pdf_docs = pdf_vector_store.similarity_search_with_score(question, k=k)
-    combined_docs = []
-    combined_docs.extend([doc for doc, _ in pdf_docs[:3]])
-    
+    with timed("keyword_search"):
+        keyword_hits, confidence = keyword_index.search(question, k=k)
+    keyword_docs = [doc for doc, _ in keyword_hits]
+    if confidence >= KEYWORD_ONLY_CONFIDENCE:
+        return keyword_docs, "keyword_only"
+
+    # Embed the question once and reuse the vector for both stores
+    with timed("embed"):
+        query_vector = embeddings.embed_query(question)
+    with timed("similarity_search", store="pdf"):
+        pdf_docs = pdf_vector_store.similarity_search_by_vector(query_vector, k=k)
+    rankings = [pdf_docs[:3], keyword_docs]
     if web_vector_store:
-        web_docs = web_vector_store.similarity_search(question, k=2)
-        combined_docs.extend(web_docs)
-        return combined_docs, "pdf_and_web"
-    return combined_docs, "pdf_only"
+        with timed("similarity_search", store="web"):
+            web_docs = web_vector_store.similarity_search_by_vector(query_vector, k=2)
+        rankings.insert(1, web_docs)
+        return fuse_rankings(rankings, k), "pdf_and_web"
+    return fuse_rankings(rankings, k), "pdf_only"
 
 # -------------------- ASK FUNCTION --------------------
+def generate_answer(question: str, history_text: str = "") -> tuple[str, List[Document]]:
+    with timed("retrieve"):
+        docs, _ = retrieve_data(question, k=TOP_K_CHUNKS)
+    with timed("prompt_assembly"):
+        context_parts = []
+        for i, d in enumerate(docs, 1):
+            source = d.metadata.get("source", "PDF Handbook")
+            source_type = d.metadata.get("source_type", "unknown")
+            content = d.page_content.strip()
+            label = f"PDF Handbook - Page {source}" if source_type == "pdf" else f"Web - {source}"
+            also = [s for s in d.metadata.get("sources", "").split(" | ")[1:] if s]
+            if also:
+                label += f" (also: {', '.join(also)})"
+            context_parts.append(f"[Source {i}: {label}]\n{content}")
+        context = "\n\n".join(context_parts) or "No relevant context found."
+        prompt = PROMPT_TEMPLATE.format(chat_history=history_text, context=context, question=question)
+    with timed("generation"):
+        result = llm.generate([prompt])
+    generation = result.generations[0][0]
+    info = generation.generation_info or {}
+    if info.get("prompt_eval_count"):
+        inc("llm_tokens_total", info["prompt_eval_count"], kind="prompt")
+    if info.get("eval_count"):
+        inc("llm_tokens_total", info["eval_count"], kind="completion")
+    answer = generation.text.strip()
+    return answer, docs
+
 def ask_question(question: str) -> str:
     history_text = "".join(
         f"User: {q}\nBot: {a}\n" for q, a in list(chat_history)[-MAX_HISTORY_LENGTH:]
     )
-    docs, _ = retrieve_data(question, k=TOP_K_CHUNKS)
-    context_parts = []
-    for i, d in enumerate(docs, 1):
-        source = d.metadata.get("source", "PDF Handbook")
-        source_type = d.metadata.get("source_type", "unknown")
-        content = d.page_content.strip()
-        label = f"PDF Handbook - Page {source}" if source_type == "pdf" else f"Web - {source}"
-        context_parts.append(f"[Source {i}: {label}]\n{content}")
-    context = "\n\n".join(context_parts) or "No relevant context found."
-    prompt = PROMPT_TEMPLATE.format(chat_history=history_text, context=context, question=question)
-    result = llm.generate([prompt])
-    answer = result.generations[0][0].text.strip()
+    answer, _ = generate_answer(question, history_text)
     chat_history.append((question, answer))
     return answer
 
 # -------------------- REFRESH WEB DATA --------------------
-def refresh_web_data():
+def refresh_web_data() -> dict:
     global web_vector_store
-    web_chunks = load_web_chunks()
+    pdf_chunks, web_chunks, report = merge_web_sources(pdf_base_chunks, load_web_chunks())
     if web_chunks:
-        web_vector_store = Chroma.from_documents(
-            web_chunks,
-            embedding=embeddings,
-            persist_directory=os.path.join(DB_DIR, "web_store")
-        )
+        sync_vector_store(pdf_vector_store, pdf_chunks)
+        keyword_index.sync("pdf", pdf_chunks)
+        if web_vector_store is None:
+            web_vector_store = open_vector_store("web_store", embeddings)
+        report["stored_chunks"] = sync_vector_store(web_vector_store, web_chunks)
+        keyword_index.sync("web", web_chunks)
+    return report
@@ -1,6 +1,12 @@
 from .web_scraper import scrape_urls_sync
 from langchain_core.documents import Document
 from typing import List, Optional
+from urllib.parse import quote
+import os
+
+# Optional base URL of a local mirror (e.g. the benchmark fixture server) that
+# serves each source at /<url-quoted original URL>
+WEB_SOURCES_MIRROR = os.getenv("WEB_SOURCES_MIRROR")
 
 # Web links to scrape
 WEB_SOURCES = [
@@ -54,7 +60,13 @@ def fetch_disaster_data(pdf_chunks: Optional[List[Document]] = None) -> List[Doc
     # Scrape web sources
     try:
         print("[DEBUG] Scraping web sources...")
-        web_docs = scrape_urls_sync(WEB_SOURCES)
+        if WEB_SOURCES_MIRROR:
+            mirrored = {f"{WEB_SOURCES_MIRROR.rstrip('/')}/{quote(url, safe='')}": url for url in WEB_SOURCES}
+            web_docs = scrape_urls_sync(list(mirrored))
+            for doc in web_docs:
+                doc.metadata["source"] = mirrored.get(doc.metadata["source"], doc.metadata["source"])
+        else:
+            web_docs = scrape_urls_sync(WEB_SOURCES)
         print(f"[DEBUG] Scraped {len(web_docs)} web documents")
         
         if web_docs:
@@ -0,0 +1,118 @@
+import re
+import time
+from typing import Dict, List, Sequence, Tuple
+import mmh3
+import numpy as np
+from langchain_core.documents import Document
+
+# MinHash settings: word 3-shingles, NUM_PERM hash permutations, and LSH banding
+# (BAND_COUNT bands of ROWS_PER_BAND rows) to find candidate pairs without an
+# all-pairs comparison. Candidates whose estimated Jaccard similarity is at least
+# JACCARD_THRESHOLD are treated as near-duplicates.
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BAND_COUNT = 16
+ROWS_PER_BAND = NUM_PERM // BAND_COUNT
+JACCARD_THRESHOLD = 0.8
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+
+def minhash(text: str) -> np.ndarray:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {" ".join(tokens)}
+    else:
+        shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (mmh3.hash(s, signed=False) for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE_PRIME
+    return permuted.min(axis=0)
+
+
+def _bands(signature: np.ndarray) -> List[Tuple[int, bytes]]:
+    return [
+        (b, signature[b * ROWS_PER_BAND:(b + 1) * ROWS_PER_BAND].tobytes())
+        for b in range(BAND_COUNT)
+    ]
+
+
+def _source_of(doc: Document) -> str:
+    source = str(doc.metadata.get("source", ""))
+    page = doc.metadata.get("page")
+    return f"{source}#page={page}" if page is not None and source else source
+
+
+def _add_source(doc: Document, source: str):
+    sources = [s for s in doc.metadata.get("sources", "").split(" | ") if s]
+    if not sources:
+        sources.append(_source_of(doc))
+    if source and source not in sources:
+        sources.append(source)
+    # Chroma metadata only accepts scalar values, so keep the list as a string
+    doc.metadata["sources"] = " | ".join(sources)
+
+
+def dedupe_chunks(chunks: List[Document], reference: Sequence[Document] = ()) -> Tuple[List[Document], Dict]:
+    """
+    Collapse near-duplicate chunks into a single chunk that keeps every source.
+    Chunks in `reference` are already indexed: they are never dropped, and any new
+    chunk that duplicates one of them is discarded after its source is recorded.
+    Returns (kept_chunks, report).
+    """
+    start_time = time.time()
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+    signatures: List[np.ndarray] = []
+    indexed: List[Document] = []
+
+    def find_match(signature: np.ndarray):
+        seen = set()
+        for band in _bands(signature):
+            for i in buckets.get(band, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                if np.mean(signatures[i] == signature) >= JACCARD_THRESHOLD:
+                    return indexed[i]
+        return None
+
+    def index(signature: np.ndarray, doc: Document):
+        for band in _bands(signature):
+            buckets.setdefault(band, []).append(len(indexed))
+        signatures.append(signature)
+        indexed.append(doc)
+
+    for doc in reference:
+        index(minhash(doc.page_content), doc)
+
+    kept = []
+    for chunk in chunks:
+        signature = minhash(chunk.page_content)
+        match = find_match(signature)
+        if match is not None:
+            _add_source(match, _source_of(chunk))
+            continue
+        _add_source(chunk, "")
+        index(signature, chunk)
+        kept.append(chunk)
+
+    removed = len(chunks) - len(kept)
+    report = {
+        "input_chunks": len(chunks),
+        "kept_chunks": len(kept),
+        "removed_chunks": removed,
+        "shrink_percent": round(100.0 * removed / len(chunks), 1) if chunks else 0.0,
+        "seconds": round(time.time() - start_time, 3),
+    }
+    print(
+        f"[DEBUG] Dedup kept {report['kept_chunks']}/{report['input_chunks']} chunks "
+        f"({report['shrink_percent']}% smaller) in {report['seconds']:.2f}s"
+    )
+    return kept, report
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+from langchain_core.documents import Document
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Common English and Tagalog function words that carry no retrieval signal
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "for", "from", "how", "i",
+    "if", "in", "is", "it", "of", "on", "or", "the", "to", "what", "when", "with",
+    "ang", "ay", "ba", "ito", "ko", "mga", "mo", "na", "ng", "nga", "po", "sa", "si", "yung",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def chunk_key(doc: Document) -> str:
+    source_type = doc.metadata.get("source_type", "")
+    return hashlib.sha1(f"{source_type}\n{doc.page_content}".encode("utf-8")).hexdigest()
+
+
+class KeywordIndex:
+    """
+    In-memory BM25 inverted index over the same chunks stored in Chroma.
+    Chunks are keyed by content hash so `sync` only tokenizes what changed,
+    and the index is persisted as JSON next to the vector stores.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Document] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+
+    @classmethod
+    def load(cls, path: str) -> "KeywordIndex":
+        index = cls(path)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                for key, item in stored.items():
+                    index._add(key, Document(page_content=item["text"], metadata=item["metadata"]))
+            except Exception as e:
+                print(f"[ERROR] Failed to load keyword index, rebuilding: {e}")
+                index = cls(path)
+        return index
+
+    def save(self):
+        with self._lock:
+            stored = {
+                key: {"text": doc.page_content, "metadata": doc.metadata}
+                for key, doc in self._docs.items()
+            }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stored, f)
+        os.replace(tmp_path, self.path)
+
+    def _add(self, key: str, doc: Document):
+        counts = Counter(tokenize(doc.page_content))
+        self._docs[key] = doc
+        self._lengths[key] = sum(counts.values())
+        self._total_length += self._lengths[key]
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[key] = tf
+
+    def _remove(self, key: str):
+        doc = self._docs.pop(key)
+        self._total_length -= self._lengths.pop(key)
+        for term in set(tokenize(doc.page_content)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+
+    def sync(self, source_type: str, chunks: List[Document]) -> Dict:
+        """
+        Make the indexed chunks of `source_type` match `chunks`, adding and
+        removing only the difference (and refreshing the metadata of chunks
+        that are already indexed), then persist the index.
+        """
+        start_time = time.time()
+        incoming = {chunk_key(chunk): chunk for chunk in chunks}
+        with self._lock:
+            current = {
+                key for key, doc in self._docs.items()
+                if doc.metadata.get("source_type") == source_type
+            }
+            removed = current - incoming.keys()
+            added = incoming.keys() - current
+            for key in removed:
+                self._remove(key)
+            for key in added:
+                self._add(key, incoming[key])
+            # same text, so the postings stay valid; only the sources may differ
+            for key in current & incoming.keys():
+                self._docs[key] = incoming[key]
+        self.save()
+        report = {"added": len(added), "removed": len(removed), "seconds": round(time.time() - start_time, 3)}
+        print(f"[DEBUG] Keyword index ({source_type}): +{report['added']} -{report['removed']} chunks in {report['seconds']:.2f}s")
+        return report
+
+    def contains(self, keys: List[str]) -> bool:
+        with self._lock:
+            return all(key in self._docs for key in keys)
+
+    def _idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        n = len(self._docs)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, question: str, k: int = 5) -> Tuple[List[Tuple[Document, float]], float]:
+        """
+        Returns (hits, confidence). `confidence` is the top hit's score relative
+        to the best score the query could reach, and is 0 unless the top hit
+        contains every query term.
+        """
+        terms = list(dict.fromkeys(tokenize(question)))
+        with self._lock:
+            if not terms or not self._docs:
+                return [], 0.0
+            avg_length = self._total_length / len(self._docs)
+            scores: Dict[str, float] = {}
+            matched: Dict[str, int] = {}
+            max_score = 0.0
+            for term in terms:
+                idf = self._idf(term)
+                max_score += idf * (BM25_K1 + 1)
+                for key, tf in self._postings.get(term, {}).items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[key] / avg_length)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    matched[key] = matched.get(key, 0) + 1
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+            hits = [(self._docs[key], score) for key, score in ranked]
+        if not ranked or matched[ranked[0][0]] < len(terms) or max_score <= 0:
+            return hits, 0.0
+        return hits, ranked[0][1] / max_score
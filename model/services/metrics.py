@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+# Prometheus metrics are kept in-process and rendered in the text exposition
+# format by render_prometheus(); all names get this prefix.
+METRIC_PREFIX = "disasterbot_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_HELP = {
+    "stage_duration_seconds": "Time spent in each request stage (embed, search, generation, upstream calls).",
+    "http_request_duration_seconds": "Flask request latency by endpoint.",
+    "llm_tokens_total": "Tokens processed by Ollama, by kind (prompt or completion).",
+    "scrape_bytes_total": "Bytes of HTML downloaded per scraped URL.",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_histograms: Dict[str, Dict[LabelKey, list]] = {}
+_counters: Dict[str, Dict[LabelKey, float]] = {}
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+# -------------------- OPTIONAL OPENTELEMETRY EXPORT --------------------
+# Enabled only when an OTLP endpoint is configured and the SDK is installed.
+_otel_tracer = None
+_otel_histograms = {}
+_otel_counters = {}
+_otel_meter = None
+
+if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+    try:
+        from opentelemetry import metrics as otel_metrics, trace as otel_trace
+        from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        _resource = Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", "disaster-alert-bot")})
+        _tracer_provider = TracerProvider(resource=_resource)
+        _tracer_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        otel_trace.set_tracer_provider(_tracer_provider)
+        otel_metrics.set_meter_provider(MeterProvider(
+            resource=_resource,
+            metric_readers=[PeriodicExportingMetricReader(OTLPMetricExporter())],
+        ))
+        _otel_tracer = otel_trace.get_tracer(__name__)
+        _otel_meter = otel_metrics.get_meter(__name__)
+        print("[DEBUG] OpenTelemetry export enabled")
+    except Exception as e:
+        print(f"[WARNING] OpenTelemetry export disabled: {e}")
+
+
+def _otel_record_histogram(name: str, value: float, labels: Dict):
+    if _otel_meter is None:
+        return
+    if name not in _otel_histograms:
+        _otel_histograms[name] = _otel_meter.create_histogram(METRIC_PREFIX + name, unit="s")
+    _otel_histograms[name].record(value, attributes=dict(_label_key(labels)))
+
+
+def _otel_record_counter(name: str, amount: float, labels: Dict):
+    if _otel_meter is None:
+        return
+    if name not in _otel_counters:
+        _otel_counters[name] = _otel_meter.create_counter(METRIC_PREFIX + name)
+    _otel_counters[name].add(amount, attributes=dict(_label_key(labels)))
+
+
+# -------------------- RECORDING --------------------
+def observe(name: str, value: float, **labels):
+    key = _label_key(labels)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        state = series.get(key)
+        if state is None:
+            # [per-bucket counts..., sum, count]
+            state = series[key] = [0] * len(LATENCY_BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                state[i] += 1
+        state[-2] += value
+        state[-1] += 1
+    _otel_record_histogram(name, value, labels)
+
+
+def inc(name: str, amount: float = 1, **labels):
+    key = _label_key(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+    _otel_record_counter(name, amount, labels)
+
+
+@contextmanager
+def timed(stage: str, **labels):
+    """
+    Time the wrapped block as `stage_duration_seconds{stage=..., status="ok"|"error"}`
+    (and an OTel span that records the exception when the block raises).
+    """
+    span = _otel_tracer.start_as_current_span(stage, attributes=dict(_label_key(labels))) if _otel_tracer else None
+    if span is not None:
+        span.__enter__()
+    start = time.perf_counter()
+    exc_info = (None, None, None)
+    try:
+        yield
+    except BaseException as e:
+        exc_info = (type(e), e, e.__traceback__)
+        raise
+    finally:
+        status = "ok" if exc_info[0] is None else "error"
+        observe("stage_duration_seconds", time.perf_counter() - start, stage=stage, status=status, **labels)
+        if span is not None:
+            span.__exit__(*exc_info)
+
+
+# -------------------- EXPORT --------------------
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def render_prometheus() -> str:
+    lines = []
+    with _lock:
+        for name, series in sorted(_histograms.items()):
+            full = METRIC_PREFIX + name
+            lines.append(f"# HELP {full} {_HELP.get(name, name)}")
+            lines.append(f"# TYPE {full} histogram")
+            for key, state in series.items():
+                for i, bound in enumerate(LATENCY_BUCKETS):
+                    lines.append(f"{full}_bucket{_format_labels(key, (('le', str(bound)),))} {state[i]}")
+                lines.append(f"{full}_bucket{_format_labels(key, (('le', '+Inf'),))} {state[-1]}")
+                lines.append(f"{full}_sum{_format_labels(key)} {state[-2]}")
+                lines.append(f"{full}_count{_format_labels(key)} {state[-1]}")
+        for name, series in sorted(_counters.items()):
+            full = METRIC_PREFIX + name
+            lines.append(f"# HELP {full} {_HELP.get(name, name)}")
+            lines.append(f"# TYPE {full} counter")
+            for key, value in series.items():
+                lines.append(f"{full}{_format_labels(key)} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+# Patterns scrubbed from captured questions before they are written
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+# Philippine mobile (09xx / +639xx, 10 digits after the prefix) and Metro Manila
+# landline (02 / +632, 8 digits) numbers; years and counts are left alone
+_PHONE_RE = re.compile(
+    r"(?<![\w+])(?:\+?63[\s-]?|\(?0)(?:9\d{2}[\s-]?\d{3}[\s-]?\d{4}|2\)?[\s-]?\d{4}[\s-]?\d{4})(?!\w)"
+)
+_URL_RE = re.compile(r"https?://\S+")
+
+
+def scrub_text(text: str) -> str:
+    text = _EMAIL_RE.sub("<email>", text)
+    text = _URL_RE.sub("<url>", text)
+    return _PHONE_RE.sub("<number>", text)
+
+
+class TrafficCapture:
+    """
+    Appends one compact JSON object per request to a JSONL log (the same
+    one-object-per-line layout as requests.jsonl) for bench.replay:
+
+        {"ts": 1730000000.123, "client": "3f2a9c1b0d4e", "method": "POST",
+         "path": "/ask", "query": {}, "body": {"message": "..."},
+         "status": 200, "latency_ms": 812.4, "cache": "MISS"}
+
+    Clients are identified by a salted hash of their address and questions are
+    scrubbed of emails, phone numbers and URLs.
+    """
+
+    def __init__(self, path: str, salt: Optional[str] = None):
+        self.path = path
+        self.salt = salt or os.urandom(16).hex()
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def client_id(self, address: Optional[str]) -> str:
+        return hashlib.sha256(f"{self.salt}:{address}".encode("utf-8")).hexdigest()[:12]
+
+    def record(self, ts: float, address: Optional[str], method: str, path: str, query: Dict,
+               body: Optional[Dict], status: int, latency_ms: float, cache: Optional[str]):
+        if body and isinstance(body.get("message"), str):
+            body = {"message": scrub_text(body["message"])}
+        elif body is not None:
+            body = {}
+        entry = {
+            "ts": round(ts, 3),
+            "client": self.client_id(address),
+            "method": method,
+            "path": path,
+            "query": query,
+            "body": body,
+            "status": status,
+            "latency_ms": round(latency_ms, 1),
+            "cache": cache,
+        }
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
@@ -0,0 +1,199 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# Open-Meteo weather codes that raise a severe-weather alert
+SEVERE_WEATHER_CODES = {95, 96, 99}
+# How often the poll loop checks for due cities
+WAKE_SECONDS = 5
+# A reading stays fresh for poll_interval plus this, covering the loop's wake-up
+# granularity and the time the next poll takes
+FRESHNESS_SLACK_SECONDS = 30
+# Failed geocodes and fetches are retried after this instead of a full poll interval
+RETRY_SECONDS = 30
+
+
+class Subscription:
+    """A subscriber's bounded event queue; the oldest event is dropped when full."""
+
+    def __init__(self, city_key: str, max_events: int):
+        self.city_key = city_key
+        self._queue = queue.Queue(maxsize=max_events)
+
+    def push(self, event: Dict):
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: float) -> Optional[Dict]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AlertHub:
+    """
+    Polls current weather once per tracked city and fans changes out to every
+    subscriber of that city, so N open browsers cost one geocode (cached) and
+    one Open-Meteo request per poll interval. Events are dicts of the form
+    {"type": "weather" | "alert" | "error", "data": {...}}.
+
+    The hub itself holds no threads per subscriber, but a WSGI server streaming
+    the events does: each open subscription keeps one request thread busy, so
+    max_subscribers must stay below the server's thread count.
+    """
+
+    def __init__(
+        self,
+        geocode: Callable[[str], Optional[Tuple[float, float, str]]],
+        fetch_weather: Callable[[str, float, float, str], Dict],
+        poll_interval: float = 300,
+        max_queued_events: int = 10,
+        max_subscribers: Optional[int] = None,
+    ):
+        self.geocode = geocode
+        self.fetch_weather = fetch_weather
+        self.poll_interval = poll_interval
+        self.max_queued_events = max_queued_events
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._subscribers: Dict[str, set] = {}
+        self._cities: Dict[str, str] = {}
+        self._coords: Dict[str, Tuple[float, float, str]] = {}
+        self._latest: Dict[str, Dict] = {}
+        self._alerts: Dict[str, Dict] = {}
+        self._next_poll_at: Dict[str, float] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._thread = None
+
+    @staticmethod
+    def city_key(city: str) -> str:
+        return " ".join(city.lower().split())
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="weather-alerts", daemon=True)
+            self._thread.start()
+
+    def subscribe(self, city: str) -> Optional[Subscription]:
+        """Subscribe to `city`, or return None when max_subscribers are already connected."""
+        key = self.city_key(city)
+        sub = Subscription(key, self.max_queued_events)
+        with self._lock:
+            if self.max_subscribers is not None and self._count() >= self.max_subscribers:
+                return None
+            self._subscribers.setdefault(key, set()).add(sub)
+            self._cities.setdefault(key, city)
+            latest, alert = self._latest.get(key), self._alerts.get(key)
+        if latest is not None:
+            sub.push({"type": "weather", "data": latest})
+            if alert is not None:
+                sub.push({"type": "alert", "data": alert})
+        else:
+            self._wake.set()
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            subs = self._subscribers.get(sub.city_key)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.city_key]
+
+    def _count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def latest(self, city: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """Most recent successfully polled weather for `city`, if it is tracked and fresh enough."""
+        key = self.city_key(city)
+        max_age = self.poll_interval + FRESHNESS_SLACK_SECONDS if max_age is None else max_age
+        with self._lock:
+            if time.time() - self._updated_at.get(key, 0) > max_age:
+                return None
+            latest = self._latest.get(key)
+        return dict(latest, city=city) if latest is not None else None
+
+    def _publish(self, key: str, event: Dict):
+        with self._lock:
+            subs = list(self._subscribers.get(key, ()))
+        for sub in subs:
+            sub.push(event)
+
+    def _retry_soon(self, key: str):
+        with self._lock:
+            self._next_poll_at[key] = time.time() + min(RETRY_SECONDS, self.poll_interval)
+
+    def _poll(self, key: str, city: str):
+        with self._lock:
+            self._next_poll_at[key] = time.time() + self.poll_interval
+        coords = self._coords.get(key)
+        if coords is None:
+            coords = self.geocode(city)
+            if not coords:
+                self._retry_soon(key)
+                self._publish(key, {"type": "error", "data": {"error": "Unable to geocode city."}})
+                return
+            self._coords[key] = coords
+        lat, lon, display_city = coords
+        try:
+            weather = self.fetch_weather(city, lat, lon, display_city)
+        except Exception as e:
+            print(f"[ERROR] Weather poll failed for {city}: {e}")
+            self._retry_soon(key)
+            if key not in self._latest:
+                self._publish(key, {"type": "error", "data": {"error": "Unable to fetch weather."}})
+            return
+
+        code = weather.get("weathercode")
+        alert = {
+            "active": code in SEVERE_WEATHER_CODES,
+            "city": city,
+            "display_city": display_city,
+            "weathercode": code,
+            "condition": weather.get("condition"),
+            "icon": weather.get("icon"),
+            "fetched_at": weather.get("fetched_at"),
+        }
+        with self._lock:
+            previous = self._latest.get(key)
+            previous_alert = self._alerts.get(key)
+            self._latest[key] = weather
+            self._alerts[key] = alert
+            self._updated_at[key] = time.time()
+        if weather != previous:
+            self._publish(key, {"type": "weather", "data": weather})
+        if previous_alert is None or (alert["active"], alert["weathercode"]) != (previous_alert["active"], previous_alert["weathercode"]):
+            if alert["active"] or previous_alert is not None:
+                self._publish(key, {"type": "alert", "data": alert})
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            now = time.time()
+            with self._lock:
+                due = [
+                    (key, self._cities[key]) for key in self._subscribers
+                    if now >= self._next_poll_at.get(key, 0)
+                ]
+                # forget cities nobody is watching any more
+                for key in list(self._cities):
+                    if key not in self._subscribers:
+                        for state in (self._cities, self._coords, self._latest, self._alerts, self._next_poll_at, self._updated_at):
+                            state.pop(key, None)
+            for key, city in due:
+                self._poll(key, city)
+            self._wake.wait(timeout=min(self.poll_interval, WAKE_SECONDS))
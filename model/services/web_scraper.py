@@ -3,6 +3,7 @@ import asyncio
 from bs4 import BeautifulSoup
 from typing import List, Optional
 from langchain_core.documents import Document
+from .metrics import inc, timed
 
 async def fetch_html(session: aiohttp.ClientSession, url: str) -> str:
     try:
@@ -24,8 +25,11 @@ def parse_html_to_text(html: str) -> str:
 
 async def scrape_single_url(url: str) -> Optional[Document]:
     async with aiohttp.ClientSession() as session:
-        html = await fetch_html(session, url)
-        text = parse_html_to_text(html)
+        with timed("scrape", url=url):
+            html = await fetch_html(session, url)
+        inc("scrape_bytes_total", len(html.encode("utf-8")), url=url)
+        with timed("parse_html", url=url):
+            text = parse_html_to_text(html)
         if text:
             return Document(page_content=text, metadata={"source": url})
         return None
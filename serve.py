@@ -0,0 +1,63 @@
+"""
+Run DisasterAlertBot with the production profile:
+
+    python serve.py
+
+Builds the static bundles once, then starts gunicorn's threaded (gthread)
+worker with WEB_THREADS threads per process. HOST and PORT choose the
+listening address.
+
+Every open /alerts/stream holds one of those threads until it ends
+(ALERT_STREAM_MAX_SECONDS, or earlier when gunicorn's write to a disconnected
+client fails). app.py therefore caps streams at ALERT_MAX_SUBSCRIBERS, by
+default WEB_THREADS minus ALERT_RESERVED_THREADS, and refuses to start when
+the cap is not below WEB_THREADS; browsers over the cap fetch /weather once
+instead of streaming. Raising WEB_THREADS raises the stream cap with it, while
+the reserved threads keep /ask, /weather and static files answering.
+
+WEB_WORKERS defaults to 1 and should normally stay there: every process loads
+its own models and indexes and runs its own AlertHub and precompute job, so
+with N processes each tracked city is polled up to N times and /metrics only
+reports the worker that answered the scrape.
+"""
+import os
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+from assets import build_static, create_assets
+
+
+class Server(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from wsgi import application
+        return application
+
+
+def main():
+    os.environ.setdefault("APP_ENV", "production")
+    # Build before forking so workers don't race to write the same bundles
+    build_static(create_assets(Flask(__name__), production=True))
+    workers = int(os.getenv("WEB_WORKERS", "1"))
+    if workers > 1:
+        print(
+            f"[WARNING] WEB_WORKERS={workers}: weather polling, answer precompute and /metrics "
+            "are per process, so upstream requests per city and metric totals are not shared"
+        )
+    Server({
+        "bind": f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}",
+        "workers": workers,
+        "worker_class": "gthread",
+        "threads": int(os.getenv("WEB_THREADS", "16")),
+        "loglevel": os.getenv("LOG_LEVEL", "info"),
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
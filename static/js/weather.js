@@ -24,11 +24,7 @@
   }
 
   // Update current weather card
-  async function loadWeather(cityOrQuery) {
-    // prefer to pass city (backend will geocode)
-    const data = await fetchJSON(`/weather?city=${encodeURIComponent(cityOrQuery)}`);
-    if (!data) return;
-
+  function renderWeather(data, cityOrQuery) {
     const tempBig = document.querySelector('.temp-big');
     if (tempBig) tempBig.innerText = (typeof data.temp === 'number') ? `${data.temp}°` : '--';
 
@@ -59,6 +55,58 @@
     if (fetchedEl) fetchedEl.innerText = data.fetched_at ? `Updated: ${data.fetched_at}` : '';
   }
 
+  // One-off fetch, used when the browser has no EventSource support
+  async function loadWeather(cityOrQuery) {
+    // prefer to pass city (backend will geocode)
+    const data = await fetchJSON(`/weather?city=${encodeURIComponent(cityOrQuery)}`);
+    if (data) renderWeather(data, cityOrQuery);
+  }
+
+  // Show or clear the severe-weather banner
+  function renderAlert(alert) {
+    const box = document.getElementById('weather-alert');
+    if (!box) return;
+    box.replaceChildren();
+    if (!alert || !alert.active) {
+      box.style.display = 'none';
+      return;
+    }
+    const icon = document.createElement('i');
+    icon.classList.add('bi', alert.icon || 'bi-exclamation-triangle-fill', 'me-2');
+    const condition = document.createElement('strong');
+    condition.textContent = alert.condition;
+    box.append(
+      icon,
+      condition,
+      ` reported near ${alert.display_city || alert.city}. Stay indoors and monitor PAGASA advisories.`
+    );
+    box.style.display = 'flex';
+  }
+
+  // Subscribe to server-pushed weather and alerts for the selected city
+  let weatherStream = null;
+  function subscribeWeather(cityOrQuery) {
+    if (weatherStream) weatherStream.close();
+    renderAlert(null);
+    if (!window.EventSource) {
+      loadWeather(cityOrQuery);
+      return;
+    }
+    weatherStream = new EventSource(`/alerts/stream?city=${encodeURIComponent(cityOrQuery)}`);
+    weatherStream.addEventListener('weather', (e) => renderWeather(JSON.parse(e.data), cityOrQuery));
+    weatherStream.addEventListener('alert', (e) => renderAlert(JSON.parse(e.data)));
+    weatherStream.addEventListener('error', (e) => {
+      if (e.data) {
+        // the server could not geocode or fetch this city: let /weather report it
+        console.warn('Weather stream error', e.data);
+        loadWeather(cityOrQuery);
+        return;
+      }
+      // the server refused the stream (e.g. too many subscribers): poll once instead
+      if (weatherStream.readyState === EventSource.CLOSED) loadWeather(cityOrQuery);
+    });
+  }
+
   // Update forecast list (Open-Meteo daily format from backend)
   async function loadForecast(cityOrQuery) {
     const data = await fetchJSON(`/forecast?city=${encodeURIComponent(cityOrQuery)}`);
@@ -101,7 +149,7 @@
     if (locationTextEls.mobile) locationTextEls.mobile.innerText = city;
     // persist display label
     try { localStorage.setItem('dab_city_display', city); } catch (e) {}
-    loadWeather(city);
+    subscribeWeather(city);
     loadForecast(city);
     const dd = document.getElementById('desktop-location-dropdown');
     if (dd) dd.style.display = 'none';
@@ -116,7 +164,7 @@
     const city = savedDisplay || getSelectedCity();
     if (locationTextEls.desktop) locationTextEls.desktop.innerText = city;
     if (locationTextEls.mobile) locationTextEls.mobile.innerText = city;
-    loadWeather(city);
+    subscribeWeather(city);
     loadForecast(city);
   });
 
@@ -0,0 +1,9 @@
+"""
+Production WSGI entry point, loaded by serve.py (gunicorn gthread workers).
+Can also be started directly:
+
+    gunicorn -k gthread --threads 16 -b 0.0.0.0:5000 wsgi:application
+"""
+from app import app
+
+application = app